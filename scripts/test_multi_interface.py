@@ -10,57 +10,80 @@ This script tests:
 """
 
 import json
-import requests
-import websocket
+import sys
+import aiohttp
+import websockets
 import asyncio
-import time
-from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:8080"
 WS_URL = "ws://localhost:8080/mcp/ws"
+WS_TIMEOUT = 5  # seconds to wait for all WebSocket responses
+HTTP_CONNECTION_LIMIT = 50  # max pooled connections in the shared HTTP session
 
-def test_http_interface():
+# Expected tool filtering for remote clients
+LOCAL_ONLY_TOOLS = frozenset({"read_file", "write_file", "vscode_create_file", "run_in_terminal"})
+COORDINATION_TOOLS = frozenset({"register_agent", "create_task", "get_task_board", "heartbeat"})
+SAFE_REMOTE_TOOLS = frozenset({"create_entities", "sequentialthinking", "get-library-docs"})
+
+async def test_http_interface(session, log):
     """Test HTTP interface and tool filtering."""
-    print("\n=== Testing HTTP Interface ===")
+    log("\n=== Testing HTTP Interface ===")
+    
+    async def fetch(path):
+        async with session.get(f"{BASE_URL}{path}") as response:
+            data = await response.json() if response.status == 200 else None
+            return response.status, data
+    
+    # The read-only probes are independent, so fetch them in parallel;
+    # every probe is awaited even if an earlier one fails
+    health, capabilities, tools = await asyncio.gather(
+        fetch("/health"),
+        fetch("/mcp/capabilities"),
+        fetch("/mcp/tools"),
+        return_exceptions=True,
+    )
     
     # Test health endpoint
     try:
-        response = requests.get(f"{BASE_URL}/health")
-        print(f"Health check: {response.status_code}")
-        if response.status_code == 200:
-            print(f"Health data: {response.json()}")
+        if isinstance(health, Exception):
+            raise health
+        status, data = health
+        log(f"Health check: {status}")
+        if status == 200:
+            log(f"Health data: {data}")
     except Exception as e:
-        print(f"Health check failed: {e}")
+        log(f"Health check failed: {e}")
         return False
     
     # Test capabilities endpoint
     try:
-        response = requests.get(f"{BASE_URL}/mcp/capabilities")
-        print(f"Capabilities: {response.status_code}")
-        if response.status_code == 200:
-            caps = response.json()
-            print(f"Tools available: {len(caps.get('tools', []))}")
-            print(f"Connection type: {caps.get('context', {}).get('connection_type')}")
-            print(f"Security level: {caps.get('context', {}).get('security_level')}")
+        if isinstance(capabilities, Exception):
+            raise capabilities
+        status, caps = capabilities
+        log(f"Capabilities: {status}")
+        if status == 200:
+            log(f"Tools available: {len(caps.get('tools', []))}")
+            log(f"Connection type: {caps.get('context', {}).get('connection_type')}")
+            log(f"Security level: {caps.get('context', {}).get('security_level')}")
             
             # Check that local-only tools are filtered out
-            tool_names = [tool.get('name') for tool in caps.get('tools', [])]
-            local_tools = ['read_file', 'vscode_create_file', 'run_in_terminal']
-            filtered_out = [tool for tool in local_tools if tool not in tool_names]
-            print(f"Local tools filtered out: {filtered_out}")
+            tool_names = frozenset(tool.get('name') for tool in caps.get('tools', ()))
+            filtered_out = sorted(LOCAL_ONLY_TOOLS - tool_names)
+            log(f"Local tools filtered out: {filtered_out}")
     except Exception as e:
-        print(f"Capabilities test failed: {e}")
+        log(f"Capabilities test failed: {e}")
         return False
     
     # Test tool list endpoint
     try:
-        response = requests.get(f"{BASE_URL}/mcp/tools")
-        print(f"Tools list: {response.status_code}")
-        if response.status_code == 200:
-            tools = response.json()
-            print(f"Filter stats: {tools.get('_meta', {}).get('filter_stats')}")
+        if isinstance(tools, Exception):
+            raise tools
+        status, tools = tools
+        log(f"Tools list: {status}")
+        if status == 200:
+            log(f"Filter stats: {tools.get('_meta', {}).get('filter_stats')}")
     except Exception as e:
-        print(f"Tools list test failed: {e}")
+        log(f"Tools list test failed: {e}")
         return False
     
     # Test agent registration
@@ -71,133 +94,127 @@ def test_http_interface():
                 "capabilities": ["testing", "analysis"]
             }
         }
-        response = requests.post(f"{BASE_URL}/mcp/tools/register_agent", 
-                               json=register_data,
-                               headers={"Content-Type": "application/json"})
-        print(f"Agent registration: {response.status_code}")
-        if response.status_code == 200:
-            result = response.json()
-            print(f"Registration result: {result.get('result')}")
-            return result.get('result', {}).get('agent_id')
+        async with session.post(f"{BASE_URL}/mcp/tools/register_agent",
+                                json=register_data) as response:
+            log(f"Agent registration: {response.status}")
+            if response.status == 200:
+                result = await response.json()
+                log(f"Registration result: {result.get('result')}")
+                return result.get('result', {}).get('agent_id')
     except Exception as e:
-        print(f"Agent registration failed: {e}")
+        log(f"Agent registration failed: {e}")
         return False
     
     return True
 
-def test_websocket_interface():
+async def test_websocket_interface(log):
     """Test WebSocket interface with real-time communication."""
-    print("\n=== Testing WebSocket Interface ===")
+    log("\n=== Testing WebSocket Interface ===")
     
     messages_received = []
     
-    def on_message(ws, message):
-        print(f"Received: {message}")
-        messages_received.append(json.loads(message))
-    
-    def on_error(ws, error):
-        print(f"WebSocket error: {error}")
+    # Send initialize message
+    init_msg = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "clientInfo": {
+                "name": "test-websocket-client",
+                "version": "1.0.0"
+            },
+            "capabilities": ["coordination"]
+        }
+    }
     
-    def on_close(ws, close_status_code, close_msg):
-        print("WebSocket connection closed")
+    # Request tools list
+    tools_msg = {
+        "jsonrpc": "2.0", 
+        "id": 2,
+        "method": "tools/list"
+    }
     
-    def on_open(ws):
-        print("WebSocket connection opened")
-        
-        # Send initialize message
-        init_msg = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "clientInfo": {
-                    "name": "test-websocket-client",
-                    "version": "1.0.0"
-                },
-                "capabilities": ["coordination"]
-            }
-        }
-        ws.send(json.dumps(init_msg))
-        
-        # Wait a bit then request tools list
-        time.sleep(0.5)
-        tools_msg = {
-            "jsonrpc": "2.0", 
-            "id": 2,
-            "method": "tools/list"
-        }
-        ws.send(json.dumps(tools_msg))
-        
-        # Register an agent
-        time.sleep(0.5)
-        register_msg = {
-            "jsonrpc": "2.0",
-            "id": 3,
-            "method": "tools/call",
-            "params": {
-                "name": "register_agent",
-                "arguments": {
-                    "name": "Test Agent WebSocket",
-                    "capabilities": ["testing", "websocket"]
-                }
+    # Register an agent
+    register_msg = {
+        "jsonrpc": "2.0",
+        "id": 3,
+        "method": "tools/call",
+        "params": {
+            "name": "register_agent",
+            "arguments": {
+                "name": "Test Agent WebSocket",
+                "capabilities": ["testing", "websocket"]
             }
         }
-        ws.send(json.dumps(register_msg))
+    }
+    
+    msgs = (init_msg, tools_msg, register_msg)
+    
+    async def exchange(ws):
+        # Requests carry distinct ids, so send them back-to-back and
+        # match the responses up as they arrive
+        for msg in msgs:
+            await ws.send(json.dumps(msg))
         
-        # Close after a delay
-        time.sleep(2)
-        ws.close()
+        pending_ids = {msg["id"] for msg in msgs}
+        async for message in ws:
+            log(f"Received: {message}")
+            response = json.loads(message)
+            messages_received.append(response)
+            
+            pending_ids.discard(response.get('id'))
+            if not pending_ids:
+                break
     
     try:
-        ws = websocket.WebSocketApp(WS_URL,
-                                  on_open=on_open,
-                                  on_message=on_message,
-                                  on_error=on_error,
-                                  on_close=on_close)
-        ws.run_forever()
+        async with websockets.connect(WS_URL) as ws:
+            log("WebSocket connection opened")
+            try:
+                await asyncio.wait_for(exchange(ws), WS_TIMEOUT)
+            except asyncio.TimeoutError:
+                log(f"WebSocket timed out after {WS_TIMEOUT}s")
+        log("WebSocket connection closed")
         
-        print(f"Messages received: {len(messages_received)}")
+        log(f"Messages received: {len(messages_received)}")
         for i, msg in enumerate(messages_received):
-            print(f"Message {i+1}: {msg.get('result', {}).get('_meta', 'No meta')}")
+            log(f"Message {i+1}: {msg.get('result', {}).get('_meta', 'No meta')}")
         
         return len(messages_received) > 0
     except Exception as e:
-        print(f"WebSocket test failed: {e}")
+        log(f"WebSocket test failed: {e}")
         return False
 
-def test_tool_filtering():
+async def test_tool_filtering(session, log):
     """Test tool filtering functionality specifically."""
-    print("\n=== Testing Tool Filtering ===")
+    log("\n=== Testing Tool Filtering ===")
     
     try:
         # Get tools from HTTP (remote context)
-        response = requests.get(f"{BASE_URL}/mcp/tools")
-        if response.status_code != 200:
-            print("Failed to get tools from HTTP")
-            return False
+        async with session.get(f"{BASE_URL}/mcp/tools") as response:
+            if response.status != 200:
+                log("Failed to get tools from HTTP")
+                return False
+            
+            remote_tools = await response.json()
         
-        remote_tools = response.json()
-        tool_names = [tool.get('name') for tool in remote_tools.get('tools', [])]
+        tool_names = frozenset(tool.get('name') for tool in remote_tools.get('tools', ()))
         
         # Check that coordination tools are present
-        coordination_tools = ['register_agent', 'create_task', 'get_task_board', 'heartbeat']
-        present_coordination = [tool for tool in coordination_tools if tool in tool_names]
-        print(f"Coordination tools present: {present_coordination}")
+        present_coordination = sorted(COORDINATION_TOOLS & tool_names)
+        log(f"Coordination tools present: {present_coordination}")
         
         # Check that local-only tools are filtered out
-        local_only_tools = ['read_file', 'write_file', 'vscode_create_file', 'run_in_terminal']
-        filtered_local = [tool for tool in local_only_tools if tool not in tool_names]
-        print(f"Local-only tools filtered: {filtered_local}")
+        filtered_local = sorted(LOCAL_ONLY_TOOLS - tool_names)
+        log(f"Local-only tools filtered: {filtered_local}")
         
         # Check that safe remote tools are present
-        safe_remote_tools = ['create_entities', 'sequentialthinking', 'get-library-docs']
-        present_safe = [tool for tool in safe_remote_tools if tool in tool_names]
-        print(f"Safe remote tools present: {present_safe}")
+        present_safe = sorted(SAFE_REMOTE_TOOLS & tool_names)
+        log(f"Safe remote tools present: {present_safe}")
         
         # Verify filter statistics
         filter_stats = remote_tools.get('_meta', {}).get('filter_stats', {})
-        print(f"Filter stats: {filter_stats}")
+        log(f"Filter stats: {filter_stats}")
         
         success = (
             len(present_coordination) >= 3 and  # Most coordination tools present
@@ -207,12 +224,12 @@ def test_tool_filtering():
         
         return success
     except Exception as e:
-        print(f"Tool filtering test failed: {e}")
+        log(f"Tool filtering test failed: {e}")
         return False
 
-def test_forbidden_tool_access():
+async def test_forbidden_tool_access(session, log):
     """Test that local-only tools are properly blocked for remote clients."""
-    print("\n=== Testing Forbidden Tool Access ===")
+    log("\n=== Testing Forbidden Tool Access ===")
     
     try:
         # Try to call a local-only tool
@@ -222,41 +239,45 @@ def test_forbidden_tool_access():
                 "agent_id": "test_agent"
             }
         }
-        response = requests.post(f"{BASE_URL}/mcp/tools/read_file",
-                               json=forbidden_data,
-                               headers={"Content-Type": "application/json"})
-        
-        print(f"Forbidden tool call status: {response.status_code}")
-        if response.status_code == 403:
-            error_data = response.json()
-            print(f"Expected 403 error: {error_data.get('error', {}).get('message')}")
-            return True
-        else:
-            print(f"Unexpected response: {response.json()}")
-            return False
+        async with session.post(f"{BASE_URL}/mcp/tools/read_file",
+                                json=forbidden_data) as response:
+            log(f"Forbidden tool call status: {response.status}")
+            if response.status == 403:
+                error_data = await response.json()
+                log(f"Expected 403 error: {error_data.get('error', {}).get('message')}")
+                return True
+            else:
+                log(f"Unexpected response: {await response.json()}")
+                return False
     except Exception as e:
-        print(f"Forbidden tool test failed: {e}")
+        log(f"Forbidden tool test failed: {e}")
         return False
 
-def main():
+async def main():
     """Run all tests."""
     print("Agent Coordinator Multi-Interface Test Suite")
     print("=" * 50)
     
-    # Test results
-    results = {}
-    
-    # HTTP Interface Test
-    results['http'] = test_http_interface()
-    
-    # WebSocket Interface Test  
-    results['websocket'] = test_websocket_interface()
-    
-    # Tool Filtering Test
-    results['tool_filtering'] = test_tool_filtering()
-    
-    # Forbidden Access Test
-    results['forbidden'] = test_forbidden_tool_access()
+    # The tests hit independent endpoints, so run them concurrently on one
+    # event loop, sharing a single keep-alive connection pool for HTTP
+    connector = aiohttp.TCPConnector(limit=HTTP_CONNECTION_LIMIT)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Each test logs into its own buffer so its section prints as one
+        # block, in the original order, once that test has finished
+        output = {name: [] for name in ('http', 'websocket', 'tool_filtering', 'forbidden')}
+        tasks = {
+            'http': test_http_interface(session, output['http'].append),
+            'websocket': test_websocket_interface(output['websocket'].append),
+            'tool_filtering': test_tool_filtering(session, output['tool_filtering'].append),
+            'forbidden': test_forbidden_tool_access(session, output['forbidden'].append),
+        }
+        tasks = {name: asyncio.ensure_future(test) for name, test in tasks.items()}
+        
+        # Test results
+        results = {}
+        for name, task in tasks.items():
+            results[name] = await task
+            print("\n".join(output[name]))
     
     # Summary
     print("\n" + "=" * 50)
@@ -279,4 +300,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    sys.exit(asyncio.run(main()))
\ No newline at end of file